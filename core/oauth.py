@@ -0,0 +1,90 @@
+"""Client OAuth Google partagé et cache du document de découverte OpenID"""
+from authlib.integrations.starlette_client import OAuth
+import asyncio
+import hishel
+import httpx
+import logging
+import re
+import time
+
+from core.config import GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET
+
+GOOGLE_DISCOVERY_URL = 'https://accounts.google.com/.well-known/openid-configuration'
+# Durée de cache par défaut du document de découverte (Google annonce max-age=3600)
+DISCOVERY_DEFAULT_TTL = 3600
+# Durée de repli quand le fournisseur interdit la mise en cache (no-store / no-cache)
+DISCOVERY_NO_STORE_TTL = 300
+# Validation de l'id_token: Google documente les deux formes de l'émetteur
+GOOGLE_ID_TOKEN_CLAIMS = {
+    'iss': {'essential': True, 'values': ['https://accounts.google.com', 'accounts.google.com']}
+}
+
+logger = logging.getLogger(__name__)
+
+# Configurer OAuth
+oauth = OAuth()
+oauth.register(
+    name='google',
+    client_id=GOOGLE_CLIENT_ID,
+    client_secret=GOOGLE_CLIENT_SECRET,
+    server_metadata_url=GOOGLE_DISCOVERY_URL,
+    client_kwargs={
+        'scope': 'openid email profile'
+    }
+)
+
+# Cache du document de découverte OpenID: (metadata, expiration en timestamp Unix)
+_discovery_cache = None
+
+# Client HTTP conscient du cache (ETag / Last-Modified): une fois le max-age écoulé,
+# le rafraîchissement est une requête conditionnelle qui reçoit un 304 sans corps
+discovery_client = httpx.AsyncClient(
+    transport=hishel.AsyncCacheTransport(
+        transport=httpx.AsyncHTTPTransport(),
+        storage=hishel.AsyncInMemoryStorage()
+    ),
+    timeout=10
+)
+
+
+def parse_max_age(cache_control: str, default: int = DISCOVERY_DEFAULT_TTL) -> int:
+    """Extraire la durée de cache d'un en-tête Cache-Control (max-age, ou repli court si no-store)"""
+    cache_control = cache_control or ''
+    if 'no-store' in cache_control or 'no-cache' in cache_control:
+        return DISCOVERY_NO_STORE_TTL
+    match = re.search(r'max-age=(\d+)', cache_control)
+    return int(match.group(1)) if match else default
+
+
+async def refresh_google_metadata() -> dict:
+    """
+    Télécharger le document de découverte et le JWKS de Google,
+    puis les épingler dans le client OAuth.
+    Authlib ne refait aucune requête de découverte tant que '_loaded_at' et 'jwks' sont présents.
+    """
+    global _discovery_cache
+    response = await discovery_client.get(GOOGLE_DISCOVERY_URL)
+    response.raise_for_status()
+    metadata = response.json()
+    ttl = parse_max_age(response.headers.get('cache-control'))
+
+    jwks_response = await discovery_client.get(metadata['jwks_uri'])
+    jwks_response.raise_for_status()
+    metadata['jwks'] = jwks_response.json()
+
+    now = time.time()
+    metadata['_loaded_at'] = now
+    _discovery_cache = (metadata, now + ttl)
+    oauth.google.server_metadata.update(metadata)
+    return metadata
+
+
+async def discovery_refresh_loop() -> None:
+    """Tâche de fond: rafraîchir les métadonnées à leur expiration (hors du chemin de login)"""
+    while True:
+        expires_at = _discovery_cache[1] if _discovery_cache else 0
+        await asyncio.sleep(max(expires_at - time.time(), 60))
+        try:
+            await refresh_google_metadata()
+        except httpx.HTTPError as e:
+            logger.warning("Rafraîchissement de la découverte OpenID impossible: %s", e)
@@ -1,85 +1,269 @@
 from fastapi import FastAPI, Request, HTTPException, Depends
-from fastapi.responses import RedirectResponse, JSONResponse, Response, HTMLResponse
+from fastapi.responses import RedirectResponse, ORJSONResponse, Response, HTMLResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi import status
 from fastapi.templating import Jinja2Templates
-from authlib.integrations.starlette_client import OAuth
-from starlette.middleware.sessions import SessionMiddleware
-from dotenv import load_dotenv
-from jose import JWTError, jwt
-from datetime import datetime, timedelta
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from markupsafe import escape
+import jwt
+from jwt import InvalidTokenError
+from cachetools import TLRUCache
+from contextlib import asynccontextmanager
+import asyncio
+import brotli
+import gzip
+import hashlib
+import httpx
+import jinja2
+import logging
+import orjson
 import os
-import json
+import threading
+import time
+
+from core.config import ACCESS_TOKEN_EXPIRE_SECONDS, ALGORITHM, APP_ENV, GOOGLE_REDIRECT_URI, SECRET_KEY
+from core.oauth import (
+    GOOGLE_ID_TOKEN_CLAIMS,
+    discovery_client,
+    discovery_refresh_loop,
+    oauth,
+    refresh_google_metadata,
+)
 
-# Charger les variables d'environnement
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-# Configuration
-GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
-GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
-# Utiliser REDIRECT_URI de l'environnement, sinon localhost pour dev
-GOOGLE_REDIRECT_URI = os.getenv("REDIRECT_URI", "http://localhost:8000/auth/callback")
-# Utiliser JWT_SECRET_KEY ou SECRET_KEY pour compatibilité
-SECRET_KEY = os.getenv("JWT_SECRET_KEY") or os.getenv("SECRET_KEY")
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-if not GOOGLE_CLIENT_ID or not GOOGLE_CLIENT_SECRET:
-    raise ValueError("GOOGLE_CLIENT_ID et GOOGLE_CLIENT_SECRET doivent être définis dans .env")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Précharger les métadonnées OpenID de Google au démarrage et les rafraîchir en tâche de fond"""
+    try:
+        await refresh_google_metadata()
+    except httpx.HTTPError as e:
+        # Authlib refera la découverte à la demande si Google est injoignable au démarrage
+        logger.warning("Préchargement de la découverte OpenID impossible: %s", e)
+    refresh_tasks = [
+        asyncio.create_task(discovery_refresh_loop()),
+        asyncio.create_task(health_refresh_loop()),
+    ]
+    yield
+    for task in refresh_tasks:
+        task.cancel()
+    await discovery_client.aclose()
 
-if not SECRET_KEY:
-    raise ValueError("JWT_SECRET_KEY ou SECRET_KEY doit être défini dans les variables d'environnement")
 
 # Créer l'application FastAPI
 app = FastAPI(
     title="OpenID Connect avec Google",
     description="Authentification OpenID Connect utilisant Google OAuth2",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configuration des templates
 templates = Jinja2Templates(directory="templates")
+if APP_ENV != "dev":
+    # Hors développement: pas de stat() des fichiers à chaque rendu,
+    # et bytecode compilé réutilisé d'un démarrage (ou d'un worker) à l'autre
+    templates.env.auto_reload = False
+    templates.env.bytecode_cache = jinja2.FileSystemBytecodeCache()
 
-# Ajouter le middleware de session
-app.add_middleware(SessionMiddleware, secret_key=SECRET_KEY)
-
-# Configurer OAuth
-oauth = OAuth()
-oauth.register(
-    name='google',
-    client_id=GOOGLE_CLIENT_ID,
-    client_secret=GOOGLE_CLIENT_SECRET,
-    server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
-    client_kwargs={
-        'scope': 'openid email profile'
-    }
-)
+
+class ImmutableStaticFiles(StaticFiles):
+    """Fichiers statiques versionnés par empreinte (?v=): mis en cache un an par le navigateur"""
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+# Servir la feuille de style séparément: l'URL change avec son contenu
+app.mount("/static", ImmutableStaticFiles(directory="static"), name="static")
+with open("static/app.css", "rb") as css_file:
+    APP_CSS_URL = f"/static/app.css?v={hashlib.sha256(css_file.read()).hexdigest()[:8]}"
+
+
+def split_template(name: str, markers: tuple = (), **context) -> list:
+    """
+    Rendre un template une seule fois et le découper autour des marqueurs.
+    Les segments obtenus sont des bytes prêts à être envoyés tels quels.
+    """
+    html = templates.get_template(name).render(**context)
+    segments = []
+    for marker in markers:
+        head, html = html.split(marker, 1)
+        segments.append(head.encode())
+    segments.append(html.encode())
+    return segments
+
+
+def join_template(segments: list, *values) -> bytes:
+    """Réassembler des segments pré-rendus avec les valeurs de la requête, échappées comme par Jinja2"""
+    parts = [segments[0]]
+    for value, segment in zip(values, segments[1:]):
+        parts.append(str(escape(value)).encode())
+        parts.append(segment)
+    return b"".join(parts)
+
+
+# Page d'accueil pré-rendue au chargement: seuls la photo, le nom et l'email varient par utilisateur
+HOME_USER_FIELDS = ('picture', 'name', 'email')
+HOME_PAGES = {
+    False: split_template("home.html", user=None, css_url=APP_CSS_URL),
+    True: split_template(
+        "home.html",
+        markers=tuple(f"@@{field}@@" for field in HOME_USER_FIELDS),
+        user={field: f"@@{field}@@" for field in HOME_USER_FIELDS},
+        css_url=APP_CSS_URL
+    ),
+}
+
+# Pages de données pré-rendues: seul le bloc JSON varie d'une requête à l'autre
+USER_PAGE = split_template("user.html", markers=("@@user_json@@",), user_json="@@user_json@@")
+PROTECTED_PAGE = split_template("protected.html", markers=("@@data_json@@",), data_json="@@data_json@@")
+HEALTH_PAGE = split_template("health.html", markers=("@@data_json@@",), data_json="@@data_json@@")
+
+# La page anonyme est identique pour tous les visiteurs: la compresser une seule fois
+HOME_ANONYMOUS = HOME_PAGES[False][0]
+HOME_ANONYMOUS_ENCODED = {
+    'br': brotli.compress(HOME_ANONYMOUS, quality=11),
+    'gzip': gzip.compress(HOME_ANONYMOUS, compresslevel=9, mtime=0),
+}
+
+
+def negotiate_encoding(request: Request, available=('br', 'gzip')):
+    """Choisir le premier encodage disponible accepté par le client (Accept-Encoding), sinon None"""
+    accepted = set()
+    for item in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = item.partition(";")
+        try:
+            quality = float(params.strip().removeprefix("q=")) if params else 1.0
+        except ValueError:
+            quality = 1.0
+        if quality > 0:
+            accepted.add(coding.strip().lower())
+    for encoding in available:
+        if encoding in accepted:
+            return encoding
+    return None
+
+
+class StateCookieMiddleware:
+    """
+    Middleware ASGI pur qui remplace SessionMiddleware pour le seul usage restant de la session:
+    l'état OAuth (state, nonce) d'Authlib entre /auth/login et /auth/callback.
+    L'authentification reposant sur le JWT, les autres routes ne paient ni signature ni vérification.
+    Chaque cookie est signé une seule fois (login) et vérifié une seule fois (callback).
+    """
+
+    def __init__(self, app, secret_key: str, login_path: str = "/auth/login",
+                 callback_path: str = "/auth/callback", cookie_name: str = "oauth_state", max_age: int = 600):
+        self.app = app
+        self.serializer = URLSafeTimedSerializer(secret_key, salt="oauth-state")
+        self.login_path = login_path
+        self.callback_path = callback_path
+        self.cookie_name = cookie_name
+        self.max_age = max_age
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in (self.login_path, self.callback_path):
+            await self.app(scope, receive, send)
+            return
+
+        is_login = scope["path"] == self.login_path
+        raw_state = HTTPConnection(scope).cookies.get(self.cookie_name)
+        scope["session"] = {}
+        # Le login repart d'un état vide: seul le callback a besoin de vérifier la signature
+        if raw_state and not is_login:
+            try:
+                scope["session"] = self.serializer.loads(raw_state, max_age=self.max_age)
+            except BadSignature:
+                pass  # Cookie expiré ou falsifié: repartir d'un état vide
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                # Cookie limité à /auth, HttpOnly et SameSite=Lax comme le JWT
+                attributes = "path=/auth; httponly; samesite=lax"
+                if is_login and scope["session"]:
+                    value = self.serializer.dumps(scope["session"])
+                    headers.append("Set-Cookie", f"{self.cookie_name}={value}; Max-Age={self.max_age}; {attributes}")
+                elif raw_state and not is_login:
+                    # État consommé par le callback: supprimer le cookie
+                    headers.append("Set-Cookie", f"{self.cookie_name}=; Max-Age=0; {attributes}")
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# Stocker l'état OAuth dans un cookie signé, uniquement sur les routes d'authentification
+app.add_middleware(StateCookieMiddleware, secret_key=SECRET_KEY)
 
 # Security pour JWT
 security = HTTPBearer()
 
 # Base de données en mémoire (à remplacer par une vraie DB en production)
-# Structure: {sub: {email, name, picture, email_verified, updated_at}}
-users_db = {}
+# Alimentée au login; les requêtes authentifiées lisent le JWT et ne l'interrogent pas
+# Répartie en 16 shards selon hash(sub) & 15 pour limiter la taille de chaque dict
+# Structure: [{sub: {email, name, picture, email_verified, updated_at, sub}}, ...]
+USERS_DB_SHARDS = 16
+users_db = [{} for _ in range(USERS_DB_SHARDS)]
+
+
+def dumps_pretty(data) -> str:
+    """Sérialiser en JSON indenté (affichage dans les templates) avec orjson"""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
+
+def utc_isoformat(timestamp: float = None) -> str:
+    """Formater un timestamp Unix (par défaut: maintenant) en ISO 8601 UTC, sans objet datetime"""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(timestamp))
 
 
 # Fonctions JWT
-def create_jwt_token(user_sub: str) -> str:
-    """Créer un JWT contenant uniquement le sub (identifiant utilisateur)"""
-    to_encode = {'sub': user_sub}
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+# Les arguments préfixés par "_" lient les globales en variables locales (LOAD_FAST au lieu de LOAD_GLOBAL)
+# sur le chemin chaud: ils ne doivent pas être passés par les appelants
+def create_jwt_token(user_data: dict, _encode=jwt.encode, _key=SECRET_KEY, _algorithm=ALGORITHM,
+                     _now=time.time, _expire_seconds=ACCESS_TOKEN_EXPIRE_SECONDS) -> str:
+    """Créer un JWT contenant les données d'affichage de l'utilisateur (email, nom, photo, sub)"""
+    now = int(_now())
+    to_encode = {**user_data, 'exp': now + _expire_seconds, 'iat': now}
+    encoded_jwt = _encode(to_encode, _key, algorithm=_algorithm)
     return encoded_jwt
 
 
-def verify_jwt_token(token: str) -> dict:
-    """Vérifier et décoder un JWT"""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+# Cache des JWT déjà vérifiés: {token brut: payload}
+# get_current_user s'exécute dans le threadpool, d'où le verrou
+JWT_CACHE_TTL = 60
+
+
+def _jwt_cache_ttu(token: str, payload: dict, now: float) -> float:
+    """Durée de vie d'une entrée du cache: 60 secondes au plus, jamais au-delà de l'expiration du JWT"""
+    return min(now + JWT_CACHE_TTL, payload.get('exp', now))
+
+
+_jwt_cache = TLRUCache(maxsize=10_000, ttu=_jwt_cache_ttu, timer=time.time)
+_jwt_cache_lock = threading.Lock()
+
+
+def verify_jwt_token(token: str, _decode=jwt.decode, _key=SECRET_KEY, _algorithms=(ALGORITHM,),
+                     _cache=_jwt_cache, _lock=_jwt_cache_lock) -> dict:
+    """Vérifier et décoder un JWT (le payload retourné est partagé via le cache: ne pas le modifier)"""
+    with _lock:
+        payload = _cache.get(token)
+    if payload is not None:
         return payload
-    except JWTError:
+    try:
+        payload = _decode(token, _key, algorithms=_algorithms)
+    except InvalidTokenError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token invalide ou expiré")
+    with _lock:
+        _cache[token] = payload
+    return payload
 
 
 def save_user_to_db(user_data: dict) -> None:
@@ -89,67 +273,86 @@ def save_user_to_db(user_data: dict) -> None:
         raise ValueError("Le 'sub' est requis pour sauvegarder un utilisateur")
     
     # Upsert: créer ou mettre à jour
-    users_db[sub] = {
+    users_db[hash(sub) & (USERS_DB_SHARDS - 1)][sub] = {
         'email': user_data.get('email'),
         'name': user_data.get('name'),
         'picture': user_data.get('picture'),
         'email_verified': user_data.get('email_verified'),
-        'updated_at': datetime.utcnow().isoformat()
+        'updated_at': utc_isoformat(),
+        'sub': sub
     }
 
 
 def get_user_from_db(sub: str) -> dict:
-    """Récupérer les données utilisateur depuis la base de données"""
-    user = users_db.get(sub)
+    """Récupérer les données utilisateur depuis la base de données (par référence: ne pas modifier)"""
+    user = users_db[hash(sub) & (USERS_DB_SHARDS - 1)].get(sub)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Utilisateur non trouvé")
-    # Ajouter le sub aux données retournées
-    return {**user, 'sub': sub}
+    return user
+
+
+ACCESS_TOKEN_COOKIE = "access_token="
+
+
+def _get_access_token(request: Request):
+    """
+    Extraire le cookie access_token directement de l'en-tête Cookie.
+    Évite request.cookies, qui analyse tous les cookies du navigateur en dict à chaque requête.
+    """
+    raw = request.headers.get("cookie")
+    if not raw:
+        return None
+    start = raw.find(ACCESS_TOKEN_COOKIE)
+    # Ignorer les cookies dont le nom se termine par "access_token" (ex: "xaccess_token=")
+    while start > 0 and raw[start - 1] not in "; ":
+        start = raw.find(ACCESS_TOKEN_COOKIE, start + 1)
+    if start < 0:
+        return None
+    start += len(ACCESS_TOKEN_COOKIE)
+    end = raw.find(";", start)
+    return raw[start:end if end >= 0 else None].strip() or None
 
 
 def get_current_user(request: Request) -> dict:
-    """Dépendance pour extraire l'utilisateur du JWT et récupérer ses données depuis la DB"""
-    token = request.cookies.get("access_token")
+    """Dépendance pour extraire l'utilisateur du JWT (payload partagé via le cache: ne pas le modifier)"""
+    token = _get_access_token(request)
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Non authentifié - JWT manquant")
     
-    # Vérifier le JWT (contient uniquement le sub)
+    # Vérifier le JWT: il contient déjà les données d'affichage, aucune lecture en DB
     jwt_payload = verify_jwt_token(token)
-    user_sub = jwt_payload.get('sub')
     
-    if not user_sub:
+    if not jwt_payload.get('sub'):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token invalide: 'sub' manquant")
     
-    # Récupérer les données complètes depuis la DB
-    user_data = get_user_from_db(user_sub)
-    
-    # Ajouter les infos du JWT (exp, iat) aux données utilisateur
-    user_data['exp'] = jwt_payload.get('exp')
-    user_data['iat'] = jwt_payload.get('iat')
-    
-    return user_data
+    return jwt_payload
 
 
 @app.get("/")
 async def home(request: Request):
     """Page d'accueil avec interface HTML"""
     # Vérifier si un JWT est présent dans les cookies
-    token = request.cookies.get("access_token")
+    token = _get_access_token(request)
     user = None
     
     if token:
         try:
             jwt_payload = verify_jwt_token(token)
-            user_sub = jwt_payload.get('sub')
-            if user_sub:
-                user = get_user_from_db(user_sub)
+            if jwt_payload.get('sub'):
+                user = jwt_payload
         except (HTTPException, Exception):
-            pass  # Token invalide ou utilisateur non trouvé, utilisateur non connecté
+            pass  # Token invalide, utilisateur non connecté
     
-    return templates.TemplateResponse("home.html", {
-        "request": request,
-        "user": user
-    })
+    if not user:
+        encoding = negotiate_encoding(request)
+        headers = {"Vary": "Accept-Encoding"}
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            return Response(content=HOME_ANONYMOUS_ENCODED[encoding], media_type="text/html", headers=headers)
+        return HTMLResponse(content=HOME_ANONYMOUS, headers=headers)
+
+    values = [user.get(field) for field in HOME_USER_FIELDS]
+    return HTMLResponse(content=join_template(HOME_PAGES[True], *values))
 
 
 @app.get("/auth/login")
@@ -173,28 +376,31 @@ async def auth_callback(request: Request):
     """
     try:
         # Échanger le code d'autorisation contre un token
-        token = await oauth.google.authorize_access_token(request)
+        # Authlib valide l'id_token localement (signature via le JWKS épinglé au démarrage,
+        # iss, aud, nonce, exp) et expose ses claims dans token['userinfo']:
+        # aucun appel à l'endpoint userinfo de Google n'est nécessaire
+        token = await oauth.google.authorize_access_token(request, claims_options=GOOGLE_ID_TOKEN_CLAIMS)
         
-        # Récupérer les informations utilisateur via OpenID Connect
-        user_info = token.get('userinfo')
+        # Claims de l'id_token (scope 'openid email profile')
+        id_claims = token.get('userinfo')
         
-        if not user_info:
+        if not id_claims:
             raise HTTPException(status_code=400, detail="Impossible de récupérer les informations utilisateur")
         
         # Préparer les données utilisateur complètes
         user_data = {
-            'email': user_info.get('email'),
-            'name': user_info.get('name'),
-            'picture': user_info.get('picture'),
-            'sub': user_info.get('sub'),
-            'email_verified': user_info.get('email_verified')
+            'email': id_claims.get('email'),
+            'name': id_claims.get('name'),
+            'picture': id_claims.get('picture'),
+            'sub': id_claims.get('sub'),
+            'email_verified': id_claims.get('email_verified')
         }
         
         # Sauvegarder les données complètes en base de données
         save_user_to_db(user_data)
         
-        # Créer un JWT contenant uniquement le sub
-        jwt_token = create_jwt_token(user_data['sub'])
+        # Créer un JWT contenant les données d'affichage: les requêtes suivantes n'interrogent pas la DB
+        jwt_token = create_jwt_token(user_data)
         
         # Rediriger vers la page d'accueil avec le JWT dans un cookie sécurisé
         response = RedirectResponse(url='/')
@@ -202,7 +408,7 @@ async def auth_callback(request: Request):
             key="access_token",
             value=jwt_token,
             httponly=True,  # Protection XSS : JavaScript ne peut pas accéder au cookie
-            max_age=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            max_age=ACCESS_TOKEN_EXPIRE_SECONDS,
             samesite="lax"  # Protection CSRF partielle + UX optimale
                            # Lax : bloque POST/PUT/DELETE cross-site (attaques CSRF)
                            # tout en autorisant la navigation GET légitime (OAuth callback)
@@ -217,7 +423,7 @@ async def auth_callback(request: Request):
 @app.get("/auth/logout")
 async def logout():
     """Déconnecter l'utilisateur en supprimant le JWT"""
-    response = JSONResponse({
+    response = ORJSONResponse({
         "message": "Déconnexion réussie",
         "authenticated": False
     })
@@ -228,11 +434,17 @@ async def logout():
 @app.get("/api/user")
 async def get_user(request: Request, user: dict = Depends(get_current_user)):
     """Récupérer les informations de l'utilisateur connecté (protégé par JWT)"""
-    user_json = json.dumps(user, indent=2, ensure_ascii=False)
-    return templates.TemplateResponse("user.html", {
-        "request": request,
-        "user_json": user_json
-    })
+    # Le contenu ne dépend que du JWT: identique pour un même (sub, iat) pendant toute sa durée de vie
+    headers = {
+        "ETag": f'"{user["sub"]}:{user["iat"]}"',
+        "Cache-Control": "private, max-age=60"
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and headers["ETag"] in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    user_json = dumps_pretty(user)
+    return HTMLResponse(content=join_template(USER_PAGE, user_json), headers=headers)
 
 
 @app.get("/api/protected")
@@ -241,28 +453,51 @@ async def protected_route(request: Request, user: dict = Depends(get_current_use
     data = {
         "message": "Accès autorisé à cette ressource protégée",
         "user_email": user.get('email'),
-        "token_expires_at": datetime.fromtimestamp(user.get('exp')).isoformat()
+        "token_expires_at": utc_isoformat(user.get('exp'))
     }
-    data_json = json.dumps(data, indent=2, ensure_ascii=False)
-    return templates.TemplateResponse("protected.html", {
-        "request": request,
-        "data_json": data_json
-    })
+    data_json = dumps_pretty(data)
+    return HTMLResponse(content=join_template(PROTECTED_PAGE, data_json))
+
+
+def render_health_page() -> bytes:
+    """Construire la page de santé avec l'horodatage courant"""
+    data = {"status": "healthy", "timestamp": utc_isoformat()}
+    return join_template(HEALTH_PAGE, dumps_pretty(data))
+
+
+# Page de santé pré-construite, rafraîchie chaque seconde par health_refresh_loop
+_health_body = render_health_page()
+
+
+async def health_refresh_loop() -> None:
+    """Tâche de fond: mettre à jour l'horodatage de la page de santé une fois par seconde"""
+    global _health_body
+    while True:
+        await asyncio.sleep(1)
+        _health_body = render_health_page()
 
 
 @app.get("/health")
-async def health_check(request: Request):
-    """Endpoint de vérification de santé"""
-    data = {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
-    data_json = json.dumps(data, indent=2, ensure_ascii=False)
-    return templates.TemplateResponse("health.html", {
-        "request": request,
-        "data_json": data_json
-    })
+async def health_check():
+    """Endpoint de vérification de santé (sondes LB/k8s): renvoie directement les bytes en cache"""
+    return HTMLResponse(content=_health_body)
 
 
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("APP_PORT", 8000))
     host = os.getenv("APP_HOST", "0.0.0.0")
-    uvicorn.run(app, host=host, port=port)
+    # Un worker par CPU par défaut: les lectures passent par le JWT, sans état partagé entre processus
+    workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    # uvloop + httptools: boucle d'événements et parseur HTTP en Cython
+    # Le mode multi-workers exige la forme "module:app" plutôt que l'objet app
+    uvicorn.run(
+        "main:app",
+        host=host,
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+        proxy_headers=True,
+        access_log=False
+    )